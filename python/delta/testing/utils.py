@@ -22,23 +22,30 @@ import sys
 
 class PySparkTestCase(unittest.TestCase):
 
-    def setUp(self):
-        self._old_sys_path = list(sys.path)
-        class_name = self.__class__.__name__
+    @classmethod
+    def setUpClass(cls):
+        cls._old_sys_path = list(sys.path)
+        class_name = cls.__name__
         # Configurations to speed up tests and reduce memory footprint
         conf = SparkConf() \
             .setAppName(class_name) \
             .setMaster('local[4]') \
             .set("spark.ui.enabled", "false") \
             .set("spark.databricks.delta.snapshotPartitions", "2") \
-            .set("spark.sql.shuffle.partitions", "5") \
+            .set("spark.sql.shuffle.partitions", "2") \
+            .set("spark.shuffle.compress", "false") \
+            .set("spark.shuffle.spill.compress", "false") \
             .set("delta.log.cacheSize", "3") \
-            .set("spark.sql.sources.parallelPartitionDiscovery.parallelism", "5")
+            .set("spark.sql.sources.parallelPartitionDiscovery.parallelism", "5") \
+            .set("spark.sql.codegen.wholeStage", "false")
         # Enable Delta's SQL syntax for Spark 3.0+. Older versions require a hack to
-        # enable it. See "DeltaSqlTests.setUp" for details.
+        # enable it. See "DeltaSqlTests.setUpClass" for details.
         conf.set("spark.sql.extensions", "io.delta.sql.DeltaSparkSessionExtension")
-        self.sc = SparkContext(conf=conf)
+        # Share one SparkContext across all tests of a class. Starting a new JVM-side context
+        # (and warming up its planner) per test dominates the run time of these small tests.
+        cls.sc = SparkContext(conf=conf)
 
-    def tearDown(self):
-        self.sc.stop()
-        sys.path = self._old_sys_path
+    @classmethod
+    def tearDownClass(cls):
+        cls.sc.stop()
+        sys.path = cls._old_sys_path
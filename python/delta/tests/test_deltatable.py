@@ -18,8 +18,10 @@ import unittest
 import tempfile
 import shutil
 import os
+from collections import Counter
+from unittest.mock import MagicMock
 
-from pyspark.sql import SQLContext, Row, SparkSession
+from pyspark.sql import Row, SparkSession
 from pyspark.sql.functions import *
 from pyspark.sql.types import *
 
@@ -29,26 +31,41 @@ from delta.testing.utils import PySparkTestCase
 
 class DeltaTableTests(PySparkTestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        super(DeltaTableTests, cls).setUpClass()
+        cls.spark = SparkSession(cls.sc)
+        # A table that is only read by tests, written once and shared by the whole class.
+        cls.sharedTempPath = tempfile.mkdtemp()
+        cls.sharedTempFile = os.path.join(cls.sharedTempPath, "sharedTempFile")
+        try:
+            cls.spark.createDataFrame([('a', 1), ('b', 2), ('c', 3)], ["key", "value"]) \
+                .write.format("delta").save(cls.sharedTempFile)
+        except:
+            cls.tearDownClass()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            shutil.rmtree(cls.sharedTempPath)
+        finally:
+            cls.spark.stop()
+            super(DeltaTableTests, cls).tearDownClass()
+
     def setUp(self):
-        super(DeltaTableTests, self).setUp()
-        self.sqlContext = SQLContext(self.sc)
-        self.spark = SparkSession(self.sc)
         self.tempPath = tempfile.mkdtemp()
         self.tempFile = os.path.join(self.tempPath, "tempFile")
 
     def tearDown(self):
-        self.spark.stop()
         shutil.rmtree(self.tempPath)
-        super(DeltaTableTests, self).tearDown()
 
     def test_forPath(self):
-        self.__writeDeltaTable([('a', 1), ('b', 2), ('c', 3)])
-        dt = DeltaTable.forPath(self.spark, self.tempFile).toDF()
+        dt = DeltaTable.forPath(self.spark, self.sharedTempFile).toDF()
         self.__checkAnswer(dt, [('a', 1), ('b', 2), ('c', 3)])
 
     def test_alias_and_toDF(self):
-        self.__writeDeltaTable([('a', 1), ('b', 2), ('c', 3)])
-        dt = DeltaTable.forPath(self.spark, self.tempFile).toDF()
+        dt = DeltaTable.forPath(self.spark, self.sharedTempFile).toDF()
         self.__checkAnswer(
             dt.alias("myTable").select('myTable.key', 'myTable.value'),
             [('a', 1), ('b', 2), ('c', 3)])
@@ -132,18 +149,20 @@ class DeltaTableTests(PySparkTestCase):
             dt.update(set=1)
 
     def test_merge(self):
-        self.__writeDeltaTable([('a', 1), ('b', 2), ('c', 3), ('d', 4)])
+        # The table is written with the baseline, so the first case needs no reset.
+        baseline = self.spark.createDataFrame([('a', 1), ('b', 2), ('c', 3), ('d', 4)],
+                                              ["key", "value"])
+        baseline.write.format("delta").save(self.tempFile)
         source = self.spark.createDataFrame([('a', -1), ('b', 0), ('e', -5), ('f', -6)], ["k", "v"])
 
         def reset_table():
-            self.__overwriteDeltaTable([('a', 1), ('b', 2), ('c', 3), ('d', 4)])
+            baseline.write.format("delta").mode("overwrite").save(self.tempFile)
 
         dt = DeltaTable.forPath(self.spark, self.tempFile)
 
         # ============== Test basic syntax ==============
 
         # String expressions in merge condition and dicts
-        reset_table()
         dt.merge(source, "key = k") \
             .whenMatchedUpdate(set={"value": "v + 0"}) \
             .whenNotMatchedInsert(values={"key": "k", "value": "v + 0"}) \
@@ -290,32 +309,47 @@ class DeltaTableTests(PySparkTestCase):
         self.__writeDeltaTable([('a', 1), ('b', 2), ('c', 3)])
         self.__overwriteDeltaTable([('a', 3), ('b', 2), ('c', 1)])
         dt = DeltaTable.forPath(self.spark, self.tempFile)
-        operations = dt.history().select('operation')
+        history = dt.history()
+        operations = history.select('operation')
         self.__checkAnswer(operations,
                            [Row("WRITE"), Row("WRITE")],
                            StructType([StructField(
                                "operation", StringType(), True)]))
 
-        lastMode = dt.history(1).select('operationParameters.mode')
+        lastMode = history.orderBy(col("version").desc()).limit(1) \
+            .select('operationParameters.mode')
         self.__checkAnswer(
             lastMode,
             [Row("Overwrite")],
             StructType([StructField("operationParameters.mode", StringType(), True)]))
 
+        self.assertEqual(dt.history(1).count(), 1)
+
     def test_vacuum(self):
         self.__writeDeltaTable([('a', 1), ('b', 2), ('c', 3)])
         dt = DeltaTable.forPath(self.spark, self.tempFile)
         self.__createFile('abc.txt', 'abcde')
         self.__createFile('bac.txt', 'abcdf')
         self.assertEqual(True, self.__checkFileExists('abc.txt'))
-        dt.vacuum()  # will not delete files as default retention is used.
-        dt.vacuum(1000)  # test whether integers work
 
-        self.assertEqual(True, self.__checkFileExists('bac.txt'))
+        # check how retention is passed to the JVM without running extra vacuum jobs
+        jdt = dt._jdt
+        dt._jdt = MagicMock()
+        try:
+            dt.vacuum()  # default retention is used
+            dt._jdt.vacuum.assert_called_once_with()
+            dt.vacuum(1000)  # test whether integers work
+            dt._jdt.vacuum.assert_called_with(1000.0)
+            self.assertIsInstance(dt._jdt.vacuum.call_args[0][0], float)
+        finally:
+            dt._jdt = jdt
+
         retentionConf = "spark.databricks.delta.retentionDurationCheck.enabled"
         self.spark.conf.set(retentionConf, "false")
-        dt.vacuum(0.0)
-        self.spark.conf.set(retentionConf, "true")
+        try:
+            dt.vacuum(0.0)
+        finally:
+            self.spark.conf.set(retentionConf, "true")
         self.assertEqual(False, self.__checkFileExists('bac.txt'))
         self.assertEqual(False, self.__checkFileExists('abc.txt'))
 
@@ -360,18 +394,15 @@ class DeltaTableTests(PySparkTestCase):
         self.assertEqual(DeltaTable.isDeltaTable(self.spark, tempFile2), True)
 
     def __checkAnswer(self, df, expectedAnswer, schema=["key", "value"]):
-        if not expectedAnswer:
-            self.assertEqual(df.count(), 0)
-            return
-        expectedDF = self.spark.createDataFrame(expectedAnswer, schema)
+        # Results are tiny, so compare them on the driver with a single Spark job. Only the
+        # number of fields in `schema` is checked.
+        expected = Counter(tuple(r) for r in expectedAnswer)
         try:
-            self.assertEqual(df.count(), expectedDF.count())
-            self.assertEqual(len(df.columns), len(expectedDF.columns))
-            self.assertEqual([], df.subtract(expectedDF).take(1))
-            self.assertEqual([], expectedDF.subtract(df).take(1))
+            self.assertEqual(len(df.columns), len(schema))
+            self.assertEqual(Counter(tuple(r) for r in df.collect()), expected)
         except AssertionError:
             print("Expected:")
-            expectedDF.show()
+            print(list(expected.elements()))
             print("Found:")
             df.show()
             raise
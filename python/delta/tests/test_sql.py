@@ -18,6 +18,7 @@ import unittest
 import tempfile
 import shutil
 import os
+from collections import Counter
 
 from pyspark.sql import SQLContext, functions, Row, SparkSession
 from pyspark import SparkContext, SparkConf
@@ -28,30 +29,44 @@ from delta.testing.utils import PySparkTestCase
 
 class DeltaSqlTests(PySparkTestCase):
 
-    def setUp(self):
-        super(DeltaSqlTests, self).setUp()
-        spark = SparkSession(self.sc)
-        if self.sc.version < "3.":
+    @classmethod
+    def setUpClass(cls):
+        super(DeltaSqlTests, cls).setUpClass()
+        spark = SparkSession(cls.sc)
+        if cls.sc.version < "3.":
             # Manually activate "DeltaSparkSessionExtension" in PySpark 2.4 in a cloned session
             # because "spark.sql.extensions" is not picked up. (See SPARK-25003).
-            self.sc._jvm.io.delta.sql.DeltaSparkSessionExtension() \
+            cls.sc._jvm.io.delta.sql.DeltaSparkSessionExtension() \
                 .apply(spark._jsparkSession.extensions())
-            self.spark = SparkSession(self.sc, spark._jsparkSession.cloneSession())
+            cls.spark = SparkSession(cls.sc, spark._jsparkSession.cloneSession())
         else:
-            self.spark = spark
+            cls.spark = spark
+        # A table that is only read by tests, written once and shared by the whole class.
+        cls.shared_temp_path = tempfile.mkdtemp()
+        cls.shared_temp_file = os.path.join(cls.shared_temp_path, "delta_sql_shared_table")
+        try:
+            cls.__writeDeltaTable(cls.shared_temp_file)
+        except:
+            cls.tearDownClass()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            shutil.rmtree(cls.shared_temp_path)
+        finally:
+            cls.spark.stop()
+            super(DeltaSqlTests, cls).tearDownClass()
+
+    def setUp(self):
         self.temp_path = tempfile.mkdtemp()
         self.temp_file = os.path.join(self.temp_path, "delta_sql_test_table")
-        # Create a simple Delta table inside the temp directory to test SQL commands.
-        df = self.spark.createDataFrame([('a', 1), ('b', 2), ('c', 3)], ["key", "value"])
-        df.write.format("delta").save(self.temp_file)
-        df.write.mode("overwrite").format("delta").save(self.temp_file)
 
     def tearDown(self):
-        self.spark.stop()
         shutil.rmtree(self.temp_path)
-        super(DeltaSqlTests, self).tearDown()
 
     def test_vacuum(self):
+        self.__writeDeltaTable(self.temp_file)
         self.spark.sql("set spark.databricks.delta.retentionDurationCheck.enabled = false")
         try:
             deleted_files = self.spark.sql("VACUUM '%s' RETAIN 0 HOURS" % self.temp_file).collect()
@@ -61,7 +76,7 @@ class DeltaSqlTests(PySparkTestCase):
             self.spark.sql("set spark.databricks.delta.retentionDurationCheck.enabled = true")
 
     def test_describe_history(self):
-        assert(len(self.spark.sql("desc history delta.`%s`" % (self.temp_file)).collect()) > 0)
+        assert(len(self.spark.sql("desc history delta.`%s`" % (self.shared_temp_file)).collect()) > 0)
 
     def test_generate(self):
         # create a delta table
@@ -109,15 +124,18 @@ class DeltaSqlTests(PySparkTestCase):
         shutil.rmtree(temp_path2)
         shutil.rmtree(temp_path3)
 
+    @classmethod
+    def __writeDeltaTable(cls, path):
+        # Create a simple Delta table with two versions to test SQL commands.
+        df = cls.spark.createDataFrame([('a', 1), ('b', 2), ('c', 3)], ["key", "value"])
+        df.write.format("delta").save(path)
+        df.write.mode("overwrite").format("delta").save(path)
+
     def __checkAnswer(self, df, expectedAnswer, schema=["key", "value"]):
-        if not expectedAnswer:
-            self.assertEqual(df.count(), 0)
-            return
-        expectedDF = self.spark.createDataFrame(expectedAnswer, schema)
-        self.assertEqual(df.count(), expectedDF.count())
-        self.assertEqual(len(df.columns), len(expectedDF.columns))
-        self.assertEqual([], df.subtract(expectedDF).take(1))
-        self.assertEqual([], expectedDF.subtract(df).take(1))
+        # Only the number of fields in `schema` is checked.
+        self.assertEqual(len(df.columns), len(schema))
+        self.assertEqual(Counter(tuple(r) for r in df.collect()),
+                         Counter(tuple(r) for r in expectedAnswer))
 
 
 if __name__ == "__main__":
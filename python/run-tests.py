@@ -21,6 +21,8 @@ import fnmatch
 import subprocess
 import sys
 import shutil
+import tempfile
+import threading
 from os import path
 
 
@@ -30,22 +32,70 @@ def test(root_dir, package):
     # framework.
     python_root_dir = path.join(root_dir, "python")
     test_dir = path.join(python_root_dir, path.join("delta", "tests"))
-    test_files = [os.path.join(test_dir, f) for f in os.listdir(test_dir)
-                  if os.path.isfile(os.path.join(test_dir, f)) and
-                  f.endswith(".py") and not f.startswith("_")]
+    test_files = sorted([os.path.join(test_dir, f) for f in os.listdir(test_dir)
+                         if os.path.isfile(os.path.join(test_dir, f)) and
+                         f.endswith(".py") and not f.startswith("_")])
     extra_class_path = path.join(python_root_dir, path.join("delta", "testing"))
 
-    for test_file in test_files:
-        try:
+    # Spark 2.4 resolves --packages into the shared Ivy cache and a fixed resolve report
+    # without locking, so resolve the package once before starting concurrent spark-submits.
+    resolve_package(package)
+
+    # Each test file runs in its own spark-submit JVM, so the files are independent of each
+    # other and can run concurrently. Their output is streamed with the file name as prefix.
+    output_lock = threading.Lock()
+    running = []
+    failed_files = []
+    try:
+        for test_file in test_files:
             cmd = ["spark-submit",
                    "--driver-class-path=%s" % extra_class_path,
                    "--packages", package, test_file]
             print("Running tests in %s\n=============" % test_file)
             print("Command: %s" % str(cmd))
-            run_cmd(cmd, stream_output=True)
-        except:
-            print("Failed tests in %s" % (test_file))
-            raise
+            sys.stdout.flush()
+            child = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            prefix = "[%s] " % path.basename(test_file)
+            pump = threading.Thread(target=stream_prefixed, args=(child, prefix, output_lock))
+            pump.start()
+            running.append((test_file, child, pump))
+
+        for (test_file, child, pump) in running:
+            exit_code = child.wait()
+            pump.join()
+            if exit_code != 0:
+                print("Failed tests in %s" % (test_file))
+                failed_files.append(test_file)
+    finally:
+        for (test_file, child, pump) in running:
+            if child.poll() is None:
+                child.kill()
+                child.wait()
+            pump.join()
+
+    if failed_files:
+        raise Exception("Failed tests in %s" % ", ".join(failed_files))
+
+
+def resolve_package(package):
+    # Submitting an empty script resolves the package without running anything.
+    temp_dir = tempfile.mkdtemp()
+    try:
+        empty_script = path.join(temp_dir, "resolve_package.py")
+        open(empty_script, "w").close()
+        print("Resolving %s" % package)
+        run_cmd(["spark-submit", "--packages", package, empty_script], stream_output=True)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def stream_prefixed(child, prefix, lock):
+    out = getattr(sys.stdout, "buffer", sys.stdout)
+    for line in iter(child.stdout.readline, b""):
+        with lock:
+            out.write(prefix.encode("utf-8") + line)
+            out.flush()
+    child.stdout.close()
 
 
 def delete_if_exists(path):